@@ -1,35 +1,49 @@
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import logging
-import json
-import time
+import atexit
+import mmap
+import orjson
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from types import SimpleNamespace
 from datetime import datetime
 from scipy.stats import linregress
 
-# Configuring logging
-log_dir = os.path.join(os.getcwd(), 'logs')
-if not os.path.exists(log_dir):
-    os.makedirs(log_dir)  # Create the logs directory if it doesn't exist
-
-timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-currency_pair = "AUD_to_NZD" 
-log_file = f'exchange_rate_analysis_log_{currency_pair}_{timestamp}.log'
-log_file = os.path.join(log_dir, log_file)
-logging.basicConfig(level=logging.INFO,
-                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                    handlers=[
-                        logging.FileHandler(log_file),  # Log messages are saved to this file
-                        logging.StreamHandler()  # Log messages are printed to the console
-                    ])
+def _configure_logging():
+    """Configure logging to a timestamped file in the 'logs' folder and to the console, unless already configured."""
+    if logging.getLogger().handlers:
+        return
+
+    log_dir = os.path.join(os.getcwd(), 'logs')
+    if not os.path.exists(log_dir):
+        os.makedirs(log_dir)  # Create the logs directory if it doesn't exist
+
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    currency_pair = "AUD_to_NZD" 
+    log_file = f'exchange_rate_analysis_log_{currency_pair}_{timestamp}.log'
+    log_file = os.path.join(log_dir, log_file)
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                        handlers=[
+                            logging.FileHandler(log_file),  # Log messages are saved to this file
+                            logging.StreamHandler()  # Log messages are printed to the console
+                        ])
+
 logger = logging.getLogger(__name__)
 
 class ExchangeRateAnalyzer:
     """Class to fetch and analyze exchange rates from AUD to NZD."""
     
-    def __init__(self, cache_file='exchange_rates_cache.json'):
+    def __init__(self, cache_file='exchange_rates_cache.db'):
         """Initialize the analyzer with an API key from an environment variable and optional caching."""
         self.api_key = os.getenv('EXCHANGE_RATE_API_KEY')
         if not self.api_key:
@@ -39,46 +53,67 @@ class ExchangeRateAnalyzer:
         self.base_currency = 'AUD'
         self.target_currency = 'NZD'
         self.cache_file = cache_file  
-        self.file_cache = self.load_cache()  # Load existing file-based cache
+        self.db = self.open_cache()  # Open the SQLite-backed file cache
         self.memory_cache = {}  # Initialize an empty dictionary for in-memory caching
-
-    def load_cache(self):
+        self._pending_writes = {}  # Rates not yet written to the file-based cache
+        atexit.register(self.flush_cache)  # Persist any pending cache updates on interpreter exit
+        self.max_workers = 8  # Number of concurrent requests used for cache misses
+        self.timeseries_threshold = 3  # Use the 'timeseries' endpoint for runs of more consecutive missing dates than this
+        self.skip_weekends = False  # Opt in to reuse Friday's rate for weekends instead of fetching them
+        self.session = self._create_session()  # Shared session with connection pooling and retries
+
+    def open_cache(self):
         """
-        Load the file-based cache from the specified JSON file within the 'cache' folder.
+        Open the file-based cache stored as an SQLite database within the 'cache' folder.
         
-        This function attempts to read the cache file from the 'cache' directory and load its JSON content
-        into a Python dictionary. If the file does not exist, it returns an empty dictionary, indicating an empty cache.
+        This function connects to the cache database, creating the 'cache' directory and the 'rates' table if needed.
+        Lookups and updates then touch a single indexed row instead of reading or rewriting the whole cache.
+        When the database is first created, entries from a legacy JSON cache file with the same name are imported.
         
         Returns:
-        dict: The content of the cache file as a dictionary or an empty dictionary if the file does not exist.
+        sqlite3.Connection: An autocommit connection to the cache database.
         """
         cache_dir = os.path.join(os.getcwd(), 'cache')
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+
         cache_file_path = os.path.join(cache_dir, self.cache_file)
-        
-        try:
-            with open(cache_file_path, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            logger.info("Cache file not found in the 'cache' folder. Initializing an empty cache.")
-            return {}
+        is_new_cache = not os.path.exists(cache_file_path)
+        db = sqlite3.connect(cache_file_path, isolation_level=None)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("CREATE TABLE IF NOT EXISTS rates (key TEXT PRIMARY KEY, rate REAL)")
 
-    def load_file_cache(self):
+        if is_new_cache:
+            json_cache_path = os.path.splitext(cache_file_path)[0] + '.json'
+            self._import_json_cache(db, json_cache_path)
+
+        return db
+
+    def _import_json_cache(self, db, json_cache_path):
         """
-        Load the file-based cache from the specified JSON file.
-        
-        This function attempts to read the cache file and load its JSON content into a Python dictionary.
-        If the file does not exist, it returns an empty dictionary, indicating an empty cache.
+        Import the entries of a legacy JSON cache file into the cache database.
         
-        Returns:
-        dict: The content of the cache file as a dictionary or an empty dictionary if the file does not exist.
+        Args:
+        db (sqlite3.Connection): The cache database to populate.
+        json_cache_path (str): The path of the JSON cache file.
         """
         try:
-            with open(self.cache_file, 'r') as f:
-                return json.load(f)
+            # Decode straight from the memory-mapped file so its contents are not copied into an intermediate buffer
+            with open(json_cache_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as buffer:
+                    legacy_cache = orjson.loads(buffer)
         except FileNotFoundError:
-            logger.info("Cache file not found. Initializing an empty cache.")
-            return {}
+            logger.info("Cache file not found in the 'cache' folder. Initializing an empty cache.")
+            return
+        except ValueError as e:  # Raised for empty files by mmap and for malformed JSON by orjson
+            logger.warning(f"Ignoring unreadable legacy cache file {json_cache_path}: {e}")
+            return
 
+        db.execute("BEGIN")
+        db.executemany("INSERT OR REPLACE INTO rates (key, rate) VALUES (?, ?)", legacy_cache.items())
+        db.execute("COMMIT")
+        logger.info(f"Imported {len(legacy_cache)} entries from the legacy cache file {json_cache_path}.")
 
     def get_cached_data(self, key):
         """
@@ -98,55 +133,188 @@ class ExchangeRateAnalyzer:
             logger.info(f"Memory cache hit for key: {key}")
             return self.memory_cache[key]
 
-        if key in self.file_cache:
+        row = self.db.execute("SELECT rate FROM rates WHERE key = ?", (key,)).fetchone()
+        if row is not None:
             logger.info(f"File cache hit for key: {key}")
-            data = self.file_cache[key]
+            data = row[0]
             self.memory_cache[key] = data  # Update in-memory cache
             return data
 
         return None
 
-
-    def save_file_cache(self):
-        """
-        Save the current state of the file-based cache to the specified JSON file within the 'cache' folder.
-        
-        This function writes the content of the file-based cache (a Python dictionary) to the cache file in JSON format.
-        It ensures that any updates to the cache during the application's runtime are persisted to disk.
-        The cache file is stored within a directory named 'cache'.
+    def _warm_memory_cache(self, first_key, last_key):
         """
-        # Ensure the 'cache' directory exists
-        cache_dir = os.path.join(os.getcwd(), 'cache')
-        if not os.path.exists(cache_dir):
-            os.makedirs(cache_dir)
+        Load every file-based cache entry with a key between `first_key` and `last_key` into the in-memory cache.
 
-        cache_file_path = os.path.join(cache_dir, self.cache_file)
+        A single range query replaces one lookup per key, so the fetch loop only needs in-memory dictionary lookups.
+        Entries already held in memory are kept, as they may not have been flushed to disk yet.
 
-        with open(cache_file_path, 'w') as f:
-            json.dump(self.file_cache, f)
-        
-        logger.info("Cache file has been updated with the latest data in the 'cache' folder.")
+        Args:
+        first_key (str): The smallest cache key to load.
+        last_key (str): The largest cache key to load.
+        """
+        rows = self.db.execute("SELECT key, rate FROM rates WHERE key BETWEEN ? AND ?", (first_key, last_key))
+        self.memory_cache.update({key: rate for key, rate in rows if key not in self.memory_cache})
 
     def set_cached_data(self, key, value):
         """
         Update the cache with the specified key-value pair.
         
-        This function updates both the in-memory cache and the file-based cache with the given key-value pair.
-        After updating the in-memory cache, it immediately persists changes to the file-based cache by saving it to disk.
+        This function updates the in-memory cache immediately and queues the key-value pair for the file-based cache.
+        Queued entries are persisted to disk by `flush_cache`.
         
         Args:
         key (str): The key under which the data should be stored in the cache.
         value: The data to be cached associated with the key.
         """
         self.memory_cache[key] = value
-        self.file_cache[key] = value
-        self.save_file_cache()  # Persist the updated file-based cache
+        self._pending_writes[key] = value  # Deferred until the next flush_cache call
         logger.info(f"Data for key: {key} has been updated in both memory and file cache.")
 
+    def flush_cache(self):
+        """
+        Persist the queued cache updates to the file-based cache.
+
+        All pending entries are upserted in a single transaction, so a fetch over N days commits once instead of N times.
+        """
+        if not self._pending_writes:
+            return
+
+        self.db.execute("BEGIN")
+        self.db.executemany("INSERT OR REPLACE INTO rates (key, rate) VALUES (?, ?)", self._pending_writes.items())
+        self.db.execute("COMMIT")
+        self._pending_writes.clear()
+
+        logger.info("Cache file has been updated with the latest data in the 'cache' folder.")
+
+    def clear_cache(self):
+        """Remove all entries from both the in-memory and file-based caches."""
+        self.memory_cache.clear()
+        self._pending_writes.clear()
+        self.db.execute("DELETE FROM rates")
+        logger.info("Cleared the in-memory and file-based caches.")
+
+    def _create_session(self):
+        """
+        Create the HTTP session used for all API requests.
+
+        The session keeps connections alive between requests, so consecutive days reuse the same TCP/TLS connection.
+        Transient failures and 5xx responses are retried by urllib3 with exponential backoff.
+
+        Returns:
+        requests.Session: A session with a pooled, retrying adapter mounted for HTTP and HTTPS.
+        """
+        retry = Retry(total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=16, max_retries=retry)
+
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _fetch_one(self, date_str, base_url, params):
+        """
+        Fetch the exchange rate for a single date from the 'historical' endpoint.
+
+        This function is safe to run from worker threads as it does not touch the caches.
+
+        Args:
+        date_str (str): The date to fetch in 'YYYY-MM-DD' format.
+        base_url (str): The API base URL the date is appended to.
+        params (dict): The query parameters shared by every request of the fetch.
+
+        Returns:
+        tuple: The date string and the fetched rate, or None as the rate if it could not be fetched.
+        """
+        try:
+            # Construct the URL using base_url and the current date
+            response = self.session.get(base_url + date_str, params=params)
+            response.raise_for_status()  # Raises an HTTPError for bad responses
+            data = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:  # ValueError covers non-JSON bodies
+            logger.error("Request failed for %s: %s", date_str, e)
+            return date_str, None
+
+        if not response.ok:
+            logger.error(f"Failed to fetch data: {response.status_code} {data.get('error', '')}")
+            return date_str, None
+
+        if data.get('success', True):
+            try:
+                return date_str, data['rates'][self.target_currency]
+            except KeyError:
+                logger.error(f"Rate for '{self.target_currency}' not found on {date_str}")
+        else:
+            logger.error("Failed to fetch rates for %s: %s", date_str, data.get('error', {}).get('info', 'No error info'))
+
+        return date_str, None
+
+    def _fetch_timeseries(self, start_date, end_date, params):
+        """
+        Fetch the exchange rates for a whole date range with a single call to the 'timeseries' endpoint.
+
+        Args:
+        start_date (str): The first date of the range in 'YYYY-MM-DD' format.
+        end_date (str): The last date of the range in 'YYYY-MM-DD' format.
+        params (dict): The query parameters shared by every request of the fetch.
+
+        Returns:
+        dict: A mapping of date strings to rates for every date returned by the API, or an empty dictionary on failure.
+        """
+        logger.info("Fetching exchange rates from %s to %s using the 'timeseries' endpoint", start_date, end_date)
+        try:
+            url = f"{self.base_url}timeseries"
+            response = self.session.get(url, params={**params, 'start_date': start_date, 'end_date': end_date})
+            response.raise_for_status()  # Raises an HTTPError for bad responses
+            data = response.json()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning("Timeseries request failed for %s to %s: %s", start_date, end_date, e)
+            return {}
+
+        if not response.ok or not data.get('success', True):
+            logger.warning("Failed to fetch timeseries rates for %s to %s", start_date, end_date)
+            return {}
+
+        rates = {}
+        for date_str, day_rates in (data.get('rates') or {}).items():
+            if isinstance(day_rates, dict) and self.target_currency in day_rates:
+                rates[date_str] = day_rates[self.target_currency]
+        return rates
+
+    def _fetch_historical(self, dates_to_fetch, rates_arr, base_url, params):
+        """
+        Fetch the given dates concurrently from the 'historical' endpoint and store the results.
+
+        Fetched rates are written into `rates_arr` at each date's position and queued for the file-based cache.
+        Dates that could not be fetched are left untouched.
+
+        Args:
+        dates_to_fetch (list): Tuples of (position, date string, cache key) for the dates to fetch.
+        rates_arr (np.ndarray): The per-day rate buffer of the current fetch.
+        base_url (str): The API base URL the dates are appended to.
+        params (dict): The query parameters shared by every request of the fetch.
+        """
+        if not dates_to_fetch:
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            fetch_one = partial(self._fetch_one, base_url=base_url, params=params)
+            results = list(executor.map(fetch_one, [date_str for _, date_str, _ in dates_to_fetch]))
+
+        for (_, rate), (i, _, cache_key) in zip(results, dates_to_fetch):
+            if rate is not None:
+                rates_arr[i] = rate
+                # Update cache with new data
+                self.set_cached_data(cache_key, rate)
+
     def fetch_exchange_rates(self, start_date: str, end_date: str) -> pd.DataFrame:
         """
-        Fetch exchange rates from the specified start date to the end date using the 'historical' endpoint.
-        This function checks the in-memory cache first for data, then the file-based cache, and finally fetches from the API if the data is not cached.
+        Fetch exchange rates from the specified start date to the end date.
+        This function loads the cached rates of the range into the in-memory cache with one query, and fetches from the API if the data is not cached.
+        Each run of more than `timeseries_threshold` consecutive missing dates is requested in one call to the 'timeseries' endpoint.
+        Any dates still missing are fetched concurrently from the 'historical' endpoint over the analyzer's pooled HTTP session.
+        When `skip_weekends` is set, uncached weekend dates take the preceding Friday's rate without a request of their own,
+        unless that Friday's rate cannot be obtained.
         Retrieved data is cached in both in-memory and file-based caches for future quick access and persistence.
         
         Args:
@@ -156,69 +324,101 @@ class ExchangeRateAnalyzer:
         Returns:
         pd.DataFrame: A DataFrame containing the exchange rates for each day in the specified date range, sorted by date.
         """
-        logger.info("Fetching exchange rates from %s to %s using the 'historical' endpoint", start_date, end_date)
-        all_rates = []
+        logger.info("Fetching exchange rates from %s to %s", start_date, end_date)
 
-        start_date_obj = datetime.strptime(start_date, "%Y-%m-%d")
-        end_date_obj = datetime.strptime(end_date, "%Y-%m-%d")
-        current_date_obj = start_date_obj
+        start_day = np.datetime64(start_date, 'D')
+        end_day = np.datetime64(end_date, 'D')
 
-        max_attempts = 3  # Define the maximum number of retry attempts
-        backoff_time = 1  # Initial backoff time in seconds
+        # Rates are written straight into preallocated buffers indexed by day; unresolved days stay NaN
+        dates_arr = np.arange(start_day, end_day + np.timedelta64(1, 'D'), dtype='datetime64[D]')
+        rates_arr = np.full(len(dates_arr), np.nan)
+        missing_dates = []  # Positions, dates and cache keys of the days to fetch
+        weekend_dates = []  # Weekend days paired with the position of the Friday whose rate they repeat
 
-        while current_date_obj <= end_date_obj:
-            current_date_str = current_date_obj.strftime("%Y-%m-%d")
-            cache_key = f"{self.base_currency}_{self.target_currency}_{current_date_str}"
+        # All date strings and weekdays are computed in one vectorized pass (1970-01-01 was a Thursday)
+        date_strs = np.datetime_as_string(dates_arr, unit='D').tolist()
+        weekdays = ((dates_arr.astype(np.int64) + 3) % 7).tolist()
+        key_prefix = f"{self.base_currency}_{self.target_currency}_"
 
-            # Attempt to retrieve cached data first
-            cached_data = self.get_cached_data(cache_key)
+        # Load the cached rates of the range, and of the Friday before it for weekend lookups, in one query
+        if date_strs:
+            first_friday_str = np.datetime_as_string(start_day - np.timedelta64(max(weekdays[0] - 4, 0), 'D'), unit='D')
+            self._warm_memory_cache(key_prefix + first_friday_str, key_prefix + date_strs[-1])
+        memory_cache = self.memory_cache
+
+        for i, current_date_str in enumerate(date_strs):
+            cache_key = key_prefix + current_date_str
 
-            if cached_data is None:
+            # Attempt to retrieve cached data first
+            cached_data = memory_cache.get(cache_key)
+
+            if cached_data is None and self.skip_weekends and weekdays[i] >= 5:
+                # Weekends repeat the previous Friday's close, so reuse that rate instead of requesting it
+                friday_i = i - (weekdays[i] - 4)
+                if friday_i >= 0:
+                    weekend_dates.append((i, friday_i, current_date_str, cache_key))
+                else:
+                    # Fridays before the range can only come from the cache
+                    friday_str = np.datetime_as_string(start_day + friday_i, unit='D')
+                    friday_rate = memory_cache.get(key_prefix + friday_str)
+                    if friday_rate is not None:
+                        logger.info(f"Using the cached rate of {friday_str} for {current_date_str}.")
+                        rates_arr[i] = friday_rate
+                    else:
+                        logger.info(f"Cache miss for {current_date_str}. Fetching fresh data.")
+                        missing_dates.append((i, current_date_str, cache_key))
+            elif cached_data is None:
                 logger.info(f"Cache miss for {current_date_str}. Fetching fresh data.")
-                attempt = 0
-                while attempt < max_attempts:
-                    try:
-                        # Construct the URL using base_url and the current date
-                        url = f"{self.base_url}{current_date_str}"
-                        params = {'access_key': self.api_key, 'base': self.base_currency, 'symbols': self.target_currency}
-
-                        response = requests.get(url, params=params)
-                        response.raise_for_status()  # Raises an HTTPError for bad responses
-                        if not response.ok:
-                            logger.error(f"Failed to fetch data: {response.status_code} {response.json().get('error', '')}")
-                            return pd.DataFrame(columns=['Date', 'ExchangeRate'])
-
-                        data = response.json()
-
-                        if data.get('success', True): 
-                            try:
-                                rate = data['rates'][self.target_currency]
-                                all_rates.append((current_date_str, rate))
-                                # Update cache with new data
-                                self.set_cached_data(cache_key, rate)
-                                break  # Exit retry loop on success
-                            except KeyError:
-                                logger.error(f"Rate for '{self.target_currency}' not found on {current_date_str}")
-                        else:
-                            logger.error("Failed to fetch rates for %s: %s", current_date_str, data.get('error', {}).get('info', 'No error info'))
-                            break  # Exit retry loop on API error
-                    except requests.exceptions.RequestException as e:
-                        logger.warning("Request failed for %s, attempt %d: %s", current_date_str, attempt + 1, e)
-                        attempt += 1
-                        if attempt < max_attempts:
-                            time.sleep(backoff_time * 2 ** attempt)  # Exponential backoff
+                missing_dates.append((i, current_date_str, cache_key))
             else:
                 logger.info(f"Using cached data for {current_date_str}.")
-                all_rates.append((current_date_str, cached_data))
+                rates_arr[i] = cached_data
+
+        # Request parameters are the same for every date, so they are built once per fetch
+        base_url = self.base_url
+        base_params = {'access_key': self.api_key, 'base': self.base_currency, 'symbols': self.target_currency}
 
-            # Move to the next day
-            current_date_obj += timedelta(days=1)
+        # Group the missing dates into runs of consecutive days
+        missing_runs = []
+        for entry in missing_dates:
+            if missing_runs and entry[0] == missing_runs[-1][-1][0] + 1:
+                missing_runs[-1].append(entry)
+            else:
+                missing_runs.append([entry])
+
+        remaining_dates = []
+        for run in missing_runs:
+            if len(run) <= self.timeseries_threshold:
+                remaining_dates.extend(run)  # Short runs and isolated days are fetched individually
+                continue
+
+            # Fetch a long run in one request; only the dates it lacks are fetched individually
+            timeseries_rates = self._fetch_timeseries(run[0][1], run[-1][1], base_params)
+            for i, date_str, cache_key in run:
+                rate = timeseries_rates.get(date_str)
+                if rate is None:
+                    remaining_dates.append((i, date_str, cache_key))
+                else:
+                    rates_arr[i] = rate
+                    self.set_cached_data(cache_key, rate)
+
+        self._fetch_historical(remaining_dates, rates_arr, base_url, base_params)
+
+        # Fill weekend dates from the rate of the preceding Friday; weekends whose Friday failed are fetched themselves
+        unresolved_weekends = []
+        for i, friday_i, date_str, cache_key in weekend_dates:
+            if np.isnan(rates_arr[friday_i]):
+                unresolved_weekends.append((i, date_str, cache_key))
+            else:
+                rates_arr[i] = rates_arr[friday_i]
+        self._fetch_historical(unresolved_weekends, rates_arr, base_url, base_params)
 
-        # Construct a DataFrame from the fetched rates
-        if all_rates:
-            df = pd.DataFrame(all_rates, columns=['Date', 'ExchangeRate'])
-            df['Date'] = pd.to_datetime(df['Date'])
-            df.sort_values('Date', inplace=True)
+        self.flush_cache()  # Persist all new rates in a single write
+
+        # Construct a DataFrame from the typed buffers, leaving out days whose rate could not be fetched
+        fetched = ~np.isnan(rates_arr)
+        if fetched.any():
+            df = pd.DataFrame({'Date': dates_arr[fetched], 'ExchangeRate': rates_arr[fetched]})
             logger.info("Successfully fetched and processed exchange rates")
             return df
         else:
@@ -226,15 +426,24 @@ class ExchangeRateAnalyzer:
             return pd.DataFrame(columns=['Date', 'ExchangeRate'])
 
     def preprocess_data(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Preprocess the data for analysis with data quality checks."""
+        """Preprocess the data for analysis with data quality checks, filling in missing dates and rates by forward fill."""
         logger.info("Starting data preprocessing")
         if df.isnull().values.any():
             logger.warning("Data contains null values. Applying forward fill.")
         
         try:
-            df.set_index('Date', inplace=True)
-            df = df.asfreq('D').ffill()  # Forward fill to handle missing values
-            df.reset_index(inplace=True)
+            dates = df['Date'].values
+            full_dates = pd.date_range(dates.min(), dates.max(), freq='D')
+
+            # Scatter the known rates onto the complete daily range; missing dates stay NaN
+            rates = np.full(len(full_dates), np.nan)
+            rates[full_dates.searchsorted(dates)] = df['ExchangeRate'].to_numpy(dtype=np.float64)
+
+            # Forward fill to handle missing values by carrying the position of the last valid rate forward
+            last_valid = np.where(np.isnan(rates), 0, np.arange(len(rates)))
+            np.maximum.accumulate(last_valid, out=last_valid)
+
+            df = pd.DataFrame({'Date': full_dates, 'ExchangeRate': rates[last_valid]})
             logger.info("Data preprocessing completed successfully")
         except Exception as e:
             logger.error("Error during data preprocessing: %s", e)
@@ -242,22 +451,65 @@ class ExchangeRateAnalyzer:
         
         return df
 
-    def analyze_data(self, df: pd.DataFrame):
-        """Perform comprehensive analysis including best, worst, average rates, trend analysis, and volatility analysis."""
+    @staticmethod
+    def _nanargmax_row(series: pd.Series) -> int:
+        """Return the integer position of the largest non-null value, for series such as rolling windows with leading nulls."""
+        return int(np.nanargmax(series.to_numpy()))
+
+    @staticmethod
+    def _rate_at(df: pd.DataFrame, position: int) -> dict:
+        """Return the date and exchange rate of the row at the given integer position."""
+        return {'Date': df['Date'].iat[position], 'ExchangeRate': df['ExchangeRate'].iat[position]}
+
+    def _summary(self, df: pd.DataFrame) -> SimpleNamespace:
+        """
+        Compute the summary statistics of the exchange rates directly on the underlying array.
+
+        The positions of the highest and lowest rates, the mean, the standard deviation and the range are derived
+        with plain ndarray reductions, so callers needing several of them do not go through pandas once per metric.
+        After `preprocess_data` the only possible null rates are leading ones, which are skipped as a view of the array.
+        The standard deviation uses one degree of freedom, matching the pandas default.
+
+        Returns:
+        SimpleNamespace: The `imax`, `imin`, `mean`, `std` and `rng` of the 'ExchangeRate' column.
+        """
+        rates = df['ExchangeRate'].to_numpy(dtype=np.float64)
+        offset = 0
+        if np.isnan(rates[0]):
+            offset = int(np.argmax(~np.isnan(rates)))  # Position of the first non-null rate
+        valid_rates = rates[offset:]
+
+        imax = offset + int(valid_rates.argmax())
+        imin = offset + int(valid_rates.argmin())
+        return SimpleNamespace(imax=imax, imin=imin, mean=valid_rates.mean(), std=valid_rates.std(ddof=1),
+                               rng=rates[imax] - rates[imin])
+
+    def analyze_data(self, df: pd.DataFrame, summary: SimpleNamespace = None):
+        """
+        Perform comprehensive analysis including best, worst, average rates, trend analysis, and volatility analysis.
+        A summary previously computed by `_summary` can be passed to avoid recomputing it.
+
+        Returns:
+        tuple: The best rate, worst rate (each a dict with 'Date' and 'ExchangeRate'), average rate, (high volatility date, max volatility) and
+        (trend, slope, intercept), which can be passed to `generate_insights` to avoid recomputing them.
+        """
         
         logger.info("Starting data analysis")
 
         try:
             # Basic analysis
-            best_rate = df.loc[df['ExchangeRate'].idxmax()]
-            worst_rate = df.loc[df['ExchangeRate'].idxmin()]
-            average_rate = df['ExchangeRate'].mean()
+            if summary is None:
+                summary = self._summary(df)
+            best_rate = self._rate_at(df, summary.imax)
+            worst_rate = self._rate_at(df, summary.imin)
+            average_rate = summary.mean
 
-            # Adding a 7-day moving average for trend analysis
-            df['7DayMA'] = df['ExchangeRate'].rolling(window=7).mean()
+            # 7-day moving average and standard deviation computed from a single rolling window
+            rolling = df['ExchangeRate'].rolling(window=7)
+            df['7DayMA'] = rolling.mean()  # Used for trend analysis
 
             # Volatility and trend analysis
-            high_volatility_date, max_volatility = self.analyze_volatility(df)
+            high_volatility_date, max_volatility = self.analyze_volatility(df, rolling_std=rolling.std())
             trend, slope, intercept = self.analyze_trends(df)
 
             # Plotting with annotations for best, worst rates, and trend analysis
@@ -267,53 +519,66 @@ class ExchangeRateAnalyzer:
         except Exception as e:
             logger.error("Error during data analysis: %s", e)
             raise
-            
 
-    def analyze_variability(self, df: pd.DataFrame):
-        """Calculate and log the standard deviation and range of exchange rates."""
+        return best_rate, worst_rate, average_rate, (high_volatility_date, max_volatility), (trend, slope, intercept)
+
+    def analyze_variability(self, df: pd.DataFrame, summary: SimpleNamespace = None):
+        """Calculate and log the standard deviation and range of exchange rates, reusing a summary if one is provided."""
         
-        std_dev = df['ExchangeRate'].std()
-        rate_range = df['ExchangeRate'].max() - df['ExchangeRate'].min()
+        if summary is None:
+            summary = self._summary(df)
+        std_dev = summary.std
+        rate_range = summary.rng
         logger.info(f"Standard Deviation of Exchange Rates: {std_dev:.4f}")
         logger.info(f"Range of Exchange Rates: {rate_range:.4f}")
         
         return std_dev, rate_range
 
 
-    def find_notable_observations(self, df: pd.DataFrame):
-        """Identify and log the dates with the highest and lowest exchange rates."""
+    def find_notable_observations(self, df: pd.DataFrame, summary: SimpleNamespace = None):
+        """Identify and log the dates with the highest and lowest exchange rates, reusing a summary if one is provided."""
         
-        highest_rate_date = df.loc[df['ExchangeRate'].idxmax(), 'Date'].strftime('%Y-%m-%d')
-        lowest_rate_date = df.loc[df['ExchangeRate'].idxmin(), 'Date'].strftime('%Y-%m-%d')
+        if summary is None:
+            summary = self._summary(df)
+        highest_rate_date = df['Date'].iat[summary.imax].strftime('%Y-%m-%d')
+        lowest_rate_date = df['Date'].iat[summary.imin].strftime('%Y-%m-%d')
         logger.info(f"Highest exchange rate observed on: {highest_rate_date}")
         logger.info(f"Lowest exchange rate observed on: {lowest_rate_date}")
         
         return highest_rate_date, lowest_rate_date
 
-    def analyze_volatility(self, df: pd.DataFrame):
-        """Analyze and log the volatility of exchange rates using a rolling standard deviation."""
+    def analyze_volatility(self, df: pd.DataFrame, rolling_std: pd.Series = None):
+        """Analyze and log the volatility of exchange rates using a rolling standard deviation, computed unless one is provided."""
         
-        df['RollingStd'] = df['ExchangeRate'].rolling(window=7).std()
-        high_volatility_date = df.loc[df['RollingStd'].idxmax(), 'Date'].strftime('%Y-%m-%d')
+        if rolling_std is None:
+            rolling_std = df['ExchangeRate'].rolling(window=7).std()
+        df['RollingStd'] = rolling_std
+        high_volatility_position = self._nanargmax_row(rolling_std)
+        high_volatility_date = df['Date'].iat[high_volatility_position].strftime('%Y-%m-%d')
         logger.info(f"Date with highest volatility observed on: {high_volatility_date}")
         
-        return high_volatility_date, df['RollingStd'].max()
+        return high_volatility_date, rolling_std.iat[high_volatility_position]
 
     
 
     def analyze_trends(self, df: pd.DataFrame):
         """Analyze and log the overall trend in exchange rates using linear regression."""
         
-        df['Timestamp'] = df['Date'].map(datetime.timestamp)
-        slope, intercept, r_value, p_value, std_err = linregress(df['Timestamp'], df['ExchangeRate'])
+        # Seconds since the epoch, converted in a single vectorized cast
+        timestamps = df['Date'].values.astype('datetime64[s]').astype(np.int64)
+        slope, intercept, r_value, p_value, std_err = linregress(timestamps, df['ExchangeRate'])
         trend = "increasing" if slope > 0 else "decreasing" if slope < 0 else "stable"
         logger.info(f"The overall trend in the exchange rate is {trend}")
         
         return trend, slope, intercept
 
 
-    def generate_insights(self, df: pd.DataFrame):
-        """Compile insights from the data analysis into a textual summary, print it, and save to a text file."""
+    def generate_insights(self, df: pd.DataFrame, analysis: tuple = None):
+        """
+        Compile insights from the data analysis into a textual summary, print it, and save to a text file.
+
+        The results returned by `analyze_data` can be passed as `analysis`; otherwise they are computed here.
+        """
         
         timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         currency_pair = f"{self.base_currency}_to_{self.target_currency}"
@@ -326,11 +591,17 @@ class ExchangeRateAnalyzer:
 
         insights_file_path = os.path.join(insights_dir, insights_file)
 
-        best_rate = df.loc[df['ExchangeRate'].idxmax()]
-        worst_rate = df.loc[df['ExchangeRate'].idxmin()]
-        average_rate = df['ExchangeRate'].mean()
-        high_volatility_date, max_volatility = self.analyze_volatility(df)
-        trend, slope, intercept = self.analyze_trends(df)
+        if analysis is None:
+            summary = self._summary(df)
+            best_rate = self._rate_at(df, summary.imax)
+            worst_rate = self._rate_at(df, summary.imin)
+            average_rate = summary.mean
+            volatility_info = self.analyze_volatility(df)
+            trend_info = self.analyze_trends(df)
+        else:
+            best_rate, worst_rate, average_rate, volatility_info, trend_info = analysis
+        high_volatility_date, max_volatility = volatility_info
+        trend, slope, intercept = trend_info
 
         insights = [
             f"Best Rate: {best_rate['ExchangeRate']} on {best_rate['Date'].date()}",
@@ -353,29 +624,32 @@ class ExchangeRateAnalyzer:
         logger.info(f"Insights generated and saved successfully in {insights_file}.")
 
 
-    def plot_exchange_rate_analysis(self, df: pd.DataFrame, best_rate: pd.Series, worst_rate: pd.Series, average_rate: float, trend: str, slope: float, intercept: float):
+    def plot_exchange_rate_analysis(self, df: pd.DataFrame, best_rate: dict, worst_rate: dict, average_rate: float, trend: str, slope: float, intercept: float):
         """Plot the exchange rates with annotations for best, worst rates, average rate, and trend line."""
 
-        plt.figure(figsize=(10, 6))
-        plt.plot(df['Date'], df['ExchangeRate'], marker='o', linestyle='-', label='Daily Rate')
-        plt.plot(df['Date'], df['7DayMA'], color='red', linestyle='-', label='7-Day Moving Average')
+        # Render off-screen with the Agg canvas; the chart is only saved to a file
+        fig = Figure(figsize=(10, 6))
+        FigureCanvasAgg(fig)
+        ax = fig.subplots()
+        ax.plot(df['Date'], df['ExchangeRate'], marker='o', linestyle='-', label='Daily Rate')
+        ax.plot(df['Date'], df['7DayMA'], color='red', linestyle='-', label='7-Day Moving Average')
 
         # Highlight the best and worst rates
-        plt.scatter(best_rate['Date'], best_rate['ExchangeRate'], color='green', label='Best Rate', zorder=5)
-        plt.scatter(worst_rate['Date'], worst_rate['ExchangeRate'], color='red', label='Worst Rate', zorder=5)
+        ax.scatter(best_rate['Date'], best_rate['ExchangeRate'], color='green', label='Best Rate', zorder=5)
+        ax.scatter(worst_rate['Date'], worst_rate['ExchangeRate'], color='red', label='Worst Rate', zorder=5)
 
         # Annotate the average rate line and trend line
-        plt.axhline(y=average_rate, color='blue', linestyle='--', label='Average Rate')
+        ax.axhline(y=average_rate, color='blue', linestyle='--', label='Average Rate')
 
         # Calculate and plot the trend line
         earliest_date, latest_date = df['Date'].min(), df['Date'].max()
-        plt.plot([earliest_date, latest_date], [earliest_date.timestamp() * slope + intercept, latest_date.timestamp() * slope + intercept], color='purple', linestyle='-', label='Trend Line')
+        ax.plot([earliest_date, latest_date], [earliest_date.timestamp() * slope + intercept, latest_date.timestamp() * slope + intercept], color='purple', linestyle='-', label='Trend Line')
 
-        plt.title('Exchange Rate Over Time with Annotations')
-        plt.xlabel('Date')
-        plt.ylabel('Exchange Rate')
-        plt.legend()
-        plt.grid(True)
+        ax.set_title('Exchange Rate Over Time with Annotations')
+        ax.set_xlabel('Date')
+        ax.set_ylabel('Exchange Rate')
+        ax.legend()
+        ax.grid(True)
         
         # Ensure the 'charts' directory exists
         charts_dir = os.path.join(os.getcwd(), 'charts')
@@ -387,11 +661,12 @@ class ExchangeRateAnalyzer:
         chart_file = f'exchange_rate_chart_{currency_pair}_{timestamp}.png'
 
         chart_file_path = os.path.join(charts_dir, chart_file)
-        plt.savefig(chart_file_path)  # Save the chart as an image file
-        plt.show()
+        fig.savefig(chart_file_path)  # Save the chart as an image file
         logger.info(f"Chart saved successfully in {chart_file}.")
         
 def main():
+    _configure_logging()
+
     # Initialize the ExchangeRateAnalyzer
     analyzer = ExchangeRateAnalyzer()
     
@@ -409,11 +684,11 @@ def main():
     
     # Analyze the preprocessed data
     logger.info("Analyzing the preprocessed data")
-    analyzer.analyze_data(df_preprocessed)
+    analysis = analyzer.analyze_data(df_preprocessed)
     
 
-    # Generate and save insights and chart
-    analyzer.generate_insights(df_preprocessed)
+    # Generate and save insights and chart, reusing the analysis results
+    analyzer.generate_insights(df_preprocessed, analysis)
 
 if __name__ == "__main__":
     main()
@@ -1,23 +1,28 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, Mock
 import pandas as pd
+import requests
 from exchange_rate_analyzer import ExchangeRateAnalyzer
 import numpy as np
 
 class TestExchangeRateAnalyzer(unittest.TestCase):
 
     def setUp(self):
-        self.analyzer = ExchangeRateAnalyzer(cache_file='test_cache.json')  # Specify a test cache file to avoid interfering with the actual cache
+        self.analyzer = ExchangeRateAnalyzer(cache_file='test_cache.db')  # Specify a test cache file to avoid interfering with the actual cache
 
-    @patch('exchange_rate_analyzer.requests.get')
+    @patch('exchange_rate_analyzer.requests.Session.get')
     def test_preprocess_data(self, mock_get):
-        # Assuming each date requires a separate API call
-        mock_responses = [
-            {'success': True, 'rates': {'NZD': 1.072039}},
-            {'success': True, 'rates': {'NZD': 1.072116}},
-            {'success': True, 'rates': {'NZD': 1.074481}}
-        ]
-        mock_get.return_value.json.side_effect = [response for response in mock_responses]
+        self.analyzer.clear_cache()
+
+        # Each date requires a separate API call; requests run concurrently so responses are keyed by date
+        mock_responses = {
+            '2024-03-10': {'success': True, 'rates': {'NZD': 1.072039}},
+            '2024-03-11': {'success': True, 'rates': {'NZD': 1.072116}},
+            '2024-03-12': {'success': True, 'rates': {'NZD': 1.074481}}
+        }
+        mock_get.side_effect = lambda url, params: Mock(json=lambda: mock_responses[url.rsplit('/', 1)[-1]])
 
         start_date = '2024-03-10'
         end_date = '2024-03-12'
@@ -32,17 +37,16 @@ class TestExchangeRateAnalyzer(unittest.TestCase):
         self.assertTrue(np.isclose(df['ExchangeRate'].values, expected_rates).all())
 
 
-    @patch('exchange_rate_analyzer.requests.get')
+    @patch('exchange_rate_analyzer.requests.Session.get')
     def test_fetch_exchange_rates_with_caching(self, mock_get):
-        self.analyzer.memory_cache.clear()
-        self.analyzer.file_cache.clear()
+        self.analyzer.clear_cache()
         
         # Setup mock responses to mimic the actual data structure and values
-        mock_responses = [
-            {'success': True, 'rates': {'NZD': 1.078546}},  # For 2024-03-15
-            {'success': True, 'rates': {'NZD': 1.078546}},  # For 2024-03-16
-        ]
-        mock_get.side_effect = [unittest.mock.Mock(json=lambda: mock_responses[i]) for i in range(2)]
+        mock_responses = {
+            '2024-03-15': {'success': True, 'rates': {'NZD': 1.078546}},
+            '2024-03-16': {'success': True, 'rates': {'NZD': 1.078546}},
+        }
+        mock_get.side_effect = lambda url, params: Mock(json=lambda: mock_responses[url.rsplit('/', 1)[-1]])
 
         # Fetch rates for the date range not cached
         self.analyzer.fetch_exchange_rates('2024-03-15', '2024-03-16')
@@ -50,6 +54,103 @@ class TestExchangeRateAnalyzer(unittest.TestCase):
         # Assertions to ensure 'get' was called twice, once for each day
         self.assertEqual(mock_get.call_count, 2)
 
+    @patch('exchange_rate_analyzer.requests.Session.get')
+    def test_skip_weekends_reuses_friday_rate(self, mock_get):
+        """Test that with skip_weekends set, weekend dates reuse Friday's rate without a request."""
+        self.analyzer.clear_cache()
+        self.analyzer.skip_weekends = True
+
+        mock_get.return_value.json.return_value = {'success': True, 'rates': {'NZD': 1.078546}}  # For 2024-03-15
+        df = self.analyzer.fetch_exchange_rates('2024-03-15', '2024-03-17')
+
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertTrue((df['ExchangeRate'].values == 1.078546).all())
+        self.assertEqual(len(df), 3)
+
+    def test_skip_weekends_uses_cached_friday_before_range(self):
+        """Test that a range starting on a weekend reuses the cached rate of the Friday before it."""
+        self.analyzer.clear_cache()
+        self.analyzer.skip_weekends = True
+        self.analyzer.set_cached_data('AUD_NZD_2024-03-15', 1.078546)
+        self.analyzer.set_cached_data('AUD_NZD_2024-03-18', 1.078031)
+
+        with patch('exchange_rate_analyzer.requests.Session.get') as mock_get:
+            df = self.analyzer.fetch_exchange_rates('2024-03-16', '2024-03-18')
+
+            mock_get.assert_not_called()
+
+        expected_rates = np.array([1.078546, 1.078546, 1.078031])
+        self.assertTrue(np.isclose(df['ExchangeRate'].values, expected_rates).all())
+
+    @patch('exchange_rate_analyzer.requests.Session.get')
+    def test_skip_weekends_fetches_weekend_when_friday_fails(self, mock_get):
+        """Test that weekend dates are fetched themselves when their Friday's rate cannot be fetched."""
+        self.analyzer.clear_cache()
+        self.analyzer.skip_weekends = True
+
+        mock_responses = {
+            '2024-03-15': {'success': False, 'error': {'info': 'Rate unavailable'}},
+            '2024-03-16': {'success': True, 'rates': {'NZD': 1.078546}},
+            '2024-03-17': {'success': True, 'rates': {'NZD': 1.077407}},
+        }
+        mock_get.side_effect = lambda url, params: Mock(json=lambda: mock_responses[url.rsplit('/', 1)[-1]])
+        df = self.analyzer.fetch_exchange_rates('2024-03-15', '2024-03-17')
+
+        self.assertEqual(mock_get.call_count, 3)
+        expected_rates = np.array([1.078546, 1.077407])
+        self.assertTrue(np.isclose(df['ExchangeRate'].values, expected_rates).all())
+
+    @patch('exchange_rate_analyzer.requests.Session.get')
+    def test_cache_persisted_after_fetch(self, mock_get):
+        """Test that fetched rates are written to the file-based cache once the fetch completes."""
+        self.analyzer.clear_cache()
+
+        mock_get.return_value.json.return_value = {'success': True, 'rates': {'NZD': 1.078546}}
+        self.analyzer.fetch_exchange_rates('2024-03-13', '2024-03-15')
+
+        # A fresh analyzer has an empty in-memory cache, so the rate must come from the database
+        reloaded = ExchangeRateAnalyzer(cache_file='test_cache.db')
+        self.assertEqual(reloaded.get_cached_data('AUD_NZD_2024-03-14'), 1.078546)
+
+    @patch('exchange_rate_analyzer.requests.Session.get')
+    def test_fetch_uses_timeseries_endpoint(self, mock_get):
+        """Test that a longer range of missing dates is fetched with a single 'timeseries' request."""
+        self.analyzer.clear_cache()
+
+        mock_get.return_value.json.return_value = {
+            'success': True,
+            'timeseries': True,
+            'rates': {
+                '2024-03-11': {'NZD': 1.072116},
+                '2024-03-12': {'NZD': 1.074481},
+                '2024-03-13': {'NZD': 1.075092},
+                '2024-03-14': {'NZD': 1.074288},
+            }
+        }
+        df = self.analyzer.fetch_exchange_rates('2024-03-11', '2024-03-14')
+
+        mock_get.assert_called_once()
+        self.assertTrue(mock_get.call_args[0][0].endswith('timeseries'))
+        expected_rates = np.array([1.072116, 1.074481, 1.075092, 1.074288])
+        self.assertTrue(np.isclose(df['ExchangeRate'].values, expected_rates).all())
+
+    @patch('exchange_rate_analyzer.requests.Session.get')
+    def test_scattered_misses_fetched_individually(self, mock_get):
+        """Test that isolated missing dates are fetched per date rather than with a 'timeseries' request."""
+        self.analyzer.clear_cache()
+        for day in range(10, 31):
+            if day not in (11, 14, 17, 20, 23):
+                self.analyzer.set_cached_data(f'AUD_NZD_2024-03-{day:02d}', 1.07)
+
+        mock_get.return_value.json.return_value = {'success': True, 'rates': {'NZD': 1.08}}
+        df = self.analyzer.fetch_exchange_rates('2024-03-10', '2024-03-30')
+
+        self.assertEqual(mock_get.call_count, 5)
+        requested_paths = [call[0][0].rsplit('/', 1)[-1] for call in mock_get.call_args_list]
+        self.assertNotIn('timeseries', requested_paths)
+        self.assertEqual(sorted(requested_paths), ['2024-03-11', '2024-03-14', '2024-03-17', '2024-03-20', '2024-03-23'])
+        self.assertEqual(len(df), 21)
+
     def test_data_completeness_and_forward_filling(self):
         """Test that preprocessing forward-fills missing data for completeness."""
         # Simulate data with a missing date
@@ -67,12 +168,23 @@ class TestExchangeRateAnalyzer(unittest.TestCase):
         self.assertEqual(missing_date_rate, data['ExchangeRate'][0])  # Check the rate is forward-filled from '2024-03-10'
 
 
-    @patch('exchange_rate_analyzer.requests.get')
+    def test_forward_filling_of_null_rates(self):
+        """Test that preprocessing forward-fills null rates as well as missing dates."""
+        data = {
+            'Date': pd.to_datetime(['2024-03-10', '2024-03-11', '2024-03-13']),
+            'ExchangeRate': [1.072039, np.nan, 1.075092]
+        }
+        df = pd.DataFrame(data)
+
+        preprocessed_df = self.analyzer.preprocess_data(df)
+        expected_rates = np.array([1.072039, 1.072039, 1.072039, 1.075092])
+        self.assertTrue(np.isclose(preprocessed_df['ExchangeRate'].values, expected_rates).all())
+
+    @patch('exchange_rate_analyzer.requests.Session.get')
     def test_api_failure_handling(self, mock_get):
         """Test the handling of API failures."""
         # Clear any cached data
-        self.analyzer.memory_cache.clear()
-        self.analyzer.file_cache.clear()
+        self.analyzer.clear_cache()
 
         # Setup mock response to simulate an API failure
         mock_get.return_value = Mock(ok=False, status_code=500, json=lambda: {"error": "Internal Server Error"})
@@ -82,13 +194,23 @@ class TestExchangeRateAnalyzer(unittest.TestCase):
         df = self.analyzer.fetch_exchange_rates(start_date, end_date)
         self.assertTrue(df.empty)
 
+    @patch('exchange_rate_analyzer.requests.Session.get')
+    def test_invalid_json_response_handling(self, mock_get):
+        """Test that a response body that is not JSON is logged and skipped instead of aborting the fetch."""
+        self.analyzer.clear_cache()
+
+        mock_get.return_value.json.side_effect = requests.exceptions.JSONDecodeError('Expecting value', '<html>', 0)
+
+        df = self.analyzer.fetch_exchange_rates('2024-03-13', '2024-03-14')
+        self.assertTrue(df.empty)
+
     def test_cache_utilization(self):
         """Test that the analyzer uses cached data when available."""
         cache_key = 'AUD_NZD_2024-03-15'
         expected_rate = 1.078546
         self.analyzer.set_cached_data(cache_key, expected_rate)  # Manually set cache
 
-        with patch('exchange_rate_analyzer.requests.get') as mock_get:
+        with patch('exchange_rate_analyzer.requests.Session.get') as mock_get:
             df = self.analyzer.fetch_exchange_rates('2024-03-15', '2024-03-15')
 
             mock_get.assert_not_called()  # Ensure no API call is made
@@ -96,5 +218,110 @@ class TestExchangeRateAnalyzer(unittest.TestCase):
         self.assertEqual(df.loc[0, 'ExchangeRate'], expected_rate)  # Check cached rate is used
 
 
+    def _open_with_legacy_cache(self, tmp_dir, contents):
+        """Create a legacy JSON cache file in a temporary 'cache' folder and open an analyzer on it."""
+        os.makedirs(os.path.join(tmp_dir, 'cache'))
+        with open(os.path.join(tmp_dir, 'cache', 'legacy_cache.json'), 'w') as f:
+            f.write(contents)
+        with patch('exchange_rate_analyzer.os.getcwd', return_value=tmp_dir):
+            analyzer = ExchangeRateAnalyzer(cache_file='legacy_cache.db')
+        self.addCleanup(analyzer.db.close)
+        return analyzer
+
+    def test_legacy_json_cache_import(self):
+        """Test that entries of a legacy JSON cache are imported when the cache database is created."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            analyzer = self._open_with_legacy_cache(
+                tmp_dir, '{"AUD_NZD_2024-03-10": 1.072039, "AUD_NZD_2024-03-11": 1.072116}')
+
+            rows = analyzer.db.execute("SELECT key, rate FROM rates ORDER BY key").fetchall()
+            self.assertEqual(rows, [('AUD_NZD_2024-03-10', 1.072039), ('AUD_NZD_2024-03-11', 1.072116)])
+
+    def test_empty_legacy_json_cache_is_skipped(self):
+        """Test that an empty legacy JSON cache is logged and skipped, leaving an empty cache database."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertLogs('exchange_rate_analyzer', level='WARNING'):
+                analyzer = self._open_with_legacy_cache(tmp_dir, '')
+
+            self.assertIsNone(analyzer.db.execute("SELECT 1 FROM rates").fetchone())
+
+    def test_malformed_legacy_json_cache_is_skipped(self):
+        """Test that a malformed legacy JSON cache is logged and skipped, leaving an empty cache database."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertLogs('exchange_rate_analyzer', level='WARNING'):
+                analyzer = self._open_with_legacy_cache(tmp_dir, '{"AUD_NZD_2024-03-10": ')
+
+            self.assertIsNone(analyzer.db.execute("SELECT 1 FROM rates").fetchone())
+
+    def _analysis_frame(self):
+        """Build a preprocessed frame with a known best, worst and average rate."""
+        data = {
+            'Date': pd.date_range('2024-03-10', periods=10, freq='D'),
+            'ExchangeRate': [1.072, 1.073, 1.071, 1.075, 1.078, 1.077, 1.080, 1.079, 1.076, 1.074]
+        }
+        return self.analyzer.preprocess_data(pd.DataFrame(data))
+
+    def test_summary_statistics(self):
+        """Test that the summary matches the pandas statistics it replaces, skipping leading null rates."""
+        df = self._analysis_frame()
+        df.loc[0, 'ExchangeRate'] = np.nan
+
+        summary = self.analyzer._summary(df)
+        rates = df['ExchangeRate']
+        self.assertEqual(summary.imax, rates.idxmax())
+        self.assertEqual(summary.imin, rates.idxmin())
+        self.assertAlmostEqual(summary.mean, rates.mean())
+        self.assertAlmostEqual(summary.std, rates.std())
+        self.assertAlmostEqual(summary.rng, rates.max() - rates.min())
+
+    def test_variability_and_notable_observations(self):
+        """Test the variability and notable observations, computed and from a precomputed summary."""
+        df = self._analysis_frame()
+        summary = self.analyzer._summary(df)
+
+        for kwargs in [{}, {'summary': summary}]:
+            std_dev, rate_range = self.analyzer.analyze_variability(df, **kwargs)
+            self.assertAlmostEqual(std_dev, df['ExchangeRate'].std())
+            self.assertAlmostEqual(rate_range, 1.080 - 1.071)
+            self.assertEqual(self.analyzer.find_notable_observations(df, **kwargs), ('2024-03-16', '2024-03-12'))
+
+        with patch.object(self.analyzer, '_summary') as mock_summary, \
+                patch.object(self.analyzer, 'plot_exchange_rate_analysis'):
+            self.analyzer.analyze_data(df, summary=summary)
+            mock_summary.assert_not_called()
+
+    def test_analyze_data_results(self):
+        """Test the shape of the analysis results that generate_insights reuses."""
+        df = self._analysis_frame()
+
+        with patch.object(self.analyzer, 'plot_exchange_rate_analysis'):
+            best_rate, worst_rate, average_rate, volatility_info, trend_info = self.analyzer.analyze_data(df)
+
+        self.assertEqual(best_rate, {'Date': pd.Timestamp('2024-03-16'), 'ExchangeRate': 1.080})
+        self.assertEqual(worst_rate, {'Date': pd.Timestamp('2024-03-12'), 'ExchangeRate': 1.071})
+        self.assertAlmostEqual(average_rate, df['ExchangeRate'].mean())
+        self.assertEqual(volatility_info[0], '2024-03-16')
+        self.assertEqual(len(trend_info), 3)
+        self.assertEqual(trend_info[0], 'increasing')
+
+    def test_generate_insights_with_and_without_analysis(self):
+        """Test that reusing the analysis results produces the same insights as recomputing them."""
+        df = self._analysis_frame()
+        with patch.object(self.analyzer, 'plot_exchange_rate_analysis'):
+            analysis = self.analyzer.analyze_data(df)
+
+        insights = []
+        for args in [(), (analysis,)]:
+            with tempfile.TemporaryDirectory() as tmp_dir, patch('exchange_rate_analyzer.os.getcwd', return_value=tmp_dir):
+                self.analyzer.generate_insights(df, *args)
+                insights_dir = os.path.join(tmp_dir, 'insights')
+                with open(os.path.join(insights_dir, os.listdir(insights_dir)[0])) as f:
+                    insights.append(f.read())
+
+        self.assertEqual(insights[0], insights[1])
+        self.assertIn("Best Rate: 1.08 on 2024-03-16", insights[0])
+        self.assertIn("Worst Rate: 1.071 on 2024-03-12", insights[0])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file